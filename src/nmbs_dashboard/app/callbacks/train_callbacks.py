@@ -2,34 +2,43 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import plotly.graph_objects as go
+import plotly.io as pio
 from dash import Dash, Input, Output, dash_table, dcc, html
 
+# Resolved once for the plain-dict figures.
+DARK_TEMPLATE = pio.templates["plotly_dark"].to_plotly_json()
 
-def _empty_figure(title: str, message: str) -> go.Figure:
-    fig = go.Figure()
-    fig.update_layout(
-        template="plotly_dark",
-        title=title,
-        xaxis={"visible": False},
-        yaxis={"visible": False},
-        margin={"l": 20, "r": 20, "t": 60, "b": 20},
-    )
-    fig.add_annotation(
-        text=message,
-        x=0.5,
-        y=0.5,
-        xref="paper",
-        yref="paper",
-        showarrow=False,
-        font={"size": 14},
-    )
-    return fig
+WEBGL_POINT_THRESHOLD = 1000
+
+
+def _empty_figure(title: str, message: str) -> Dict[str, Any]:
+    return {
+        "data": [],
+        "layout": {
+            "template": DARK_TEMPLATE,
+            "title": {"text": title},
+            "xaxis": {"visible": False},
+            "yaxis": {"visible": False},
+            "margin": {"l": 20, "r": 20, "t": 60, "b": 20},
+            "annotations": [
+                {
+                    "text": message,
+                    "x": 0.5,
+                    "y": 0.5,
+                    "xref": "paper",
+                    "yref": "paper",
+                    "showarrow": False,
+                    "font": {"size": 14},
+                }
+            ],
+        },
+    }
 
 
-def _build_delay_figure(train: Dict[str, Any]) -> go.Figure:
+def _build_delay_figure(train: Dict[str, Any]) -> Dict[str, Any]:
     history = train.get("delay_history", [])
     if not history:
         return _empty_figure("Vertraging doorheen snapshots", "Geen vertragingdata beschikbaar.")
@@ -38,31 +47,31 @@ def _build_delay_figure(train: Dict[str, Any]) -> go.Figure:
     y = [item.get("delay_minutes", 0) for item in history]
     source = [item.get("source", "unknown") for item in history]
 
-    fig = go.Figure(
-        data=[
-            go.Scatter(
-                x=x,
-                y=y,
-                mode="lines+markers",
-                line={"color": "#33a1ff", "width": 2},
-                marker={"size": 7, "color": "#9ad0ff"},
-                text=source,
-                hovertemplate="Snapshot: %{x}<br>Vertraging: %{y} min<br>Bron: %{text}<extra></extra>",
-                name="vertraging",
-            )
-        ]
-    )
-    fig.update_layout(
-        template="plotly_dark",
-        title="Vertraging doorheen snapshots",
-        xaxis_title="Snapshot",
-        yaxis_title="Vertraging (min)",
-        margin={"l": 50, "r": 20, "t": 60, "b": 50},
-    )
-    return fig
+    return {
+        "data": [
+            {
+                "type": "scattergl" if len(history) > WEBGL_POINT_THRESHOLD else "scatter",
+                "x": x,
+                "y": y,
+                "mode": "lines+markers",
+                "line": {"color": "#33a1ff", "width": 2},
+                "marker": {"size": 7, "color": "#9ad0ff"},
+                "text": source,
+                "hovertemplate": "Snapshot: %{x}<br>Vertraging: %{y} min<br>Bron: %{text}<extra></extra>",
+                "name": "vertraging",
+            }
+        ],
+        "layout": {
+            "template": DARK_TEMPLATE,
+            "title": {"text": "Vertraging doorheen snapshots"},
+            "xaxis": {"title": {"text": "Snapshot"}},
+            "yaxis": {"title": {"text": "Vertraging (min)"}},
+            "margin": {"l": 50, "r": 20, "t": 60, "b": 50},
+        },
+    }
 
 
-def _build_route_figure(train: Dict[str, Any]) -> go.Figure:
+def _build_route_figure(train: Dict[str, Any]) -> Dict[str, Any]:
     trajectories = train.get("trajectory_updates", [])
     if not trajectories:
         return _empty_figure("Traject", "Geen trajectdata beschikbaar voor deze trein.")
@@ -74,62 +83,69 @@ def _build_route_figure(train: Dict[str, Any]) -> go.Figure:
     if len(valid_stops) < 2:
         return _empty_figure("Traject", "Onvoldoende coördinaten om een traject te tonen.")
 
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scattergeo(
-            lat=[stop["lat"] for stop in valid_stops],
-            lon=[stop["lon"] for stop in valid_stops],
-            mode="lines+markers",
-            line={"width": 3, "color": "#58d68d"},
-            marker={"size": 8, "color": "#ecf0f1"},
-            text=[
-                f"{stop.get('station_name') or 'Onbekend station'}<br>{stop.get('stop_id')}<br>Delay: {round(stop.get('delay_seconds', 0)/60, 2)} min"
+    traces: List[Dict[str, Any]] = [
+        {
+            "type": "scattergeo",
+            "lat": [stop["lat"] for stop in valid_stops],
+            "lon": [stop["lon"] for stop in valid_stops],
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#58d68d"},
+            "marker": {"size": 8, "color": "#ecf0f1"},
+            "customdata": [
+                [stop.get("station_name") or "Onbekend station", stop.get("stop_id"), round(stop.get("delay_seconds", 0) / 60, 2)]
                 for stop in valid_stops
             ],
-            hovertemplate="%{text}<extra></extra>",
-            name="stops",
-        )
-    )
+            "hovertemplate": "%{customdata[0]}<br>%{customdata[1]}<br>Delay: %{customdata[2]} min<extra></extra>",
+            "name": "stops",
+        }
+    ]
 
     current = train.get("current_position", {})
     if current.get("lat") is not None and current.get("lon") is not None:
-        current_label = (
-            f"Huidige positie<br>{current.get('current_station') or 'Onbekend'}"
-            f"<br>Volgende: {current.get('next_station') or '-'}"
-            f"<br>Status: {current.get('status') or '-'}"
-            f"<br>Vertraging: {current.get('delay_minutes', 0)} min"
-        )
-        fig.add_trace(
-            go.Scattergeo(
-                lat=[current.get("lat")],
-                lon=[current.get("lon")],
-                mode="markers",
-                marker={"size": 14, "color": "#ff6b6b", "symbol": "diamond"},
-                text=[current_label],
-                hovertemplate="%{text}<extra></extra>",
-                name="huidige positie",
-            )
+        traces.append(
+            {
+                "type": "scattergeo",
+                "lat": [current.get("lat")],
+                "lon": [current.get("lon")],
+                "mode": "markers",
+                "marker": {"size": 14, "color": "#ff6b6b", "symbol": "diamond"},
+                "customdata": [
+                    [
+                        current.get("current_station") or "Onbekend",
+                        current.get("next_station") or "-",
+                        current.get("status") or "-",
+                        current.get("delay_minutes", 0),
+                    ]
+                ],
+                "hovertemplate": (
+                    "Huidige positie<br>%{customdata[0]}<br>Volgende: %{customdata[1]}"
+                    "<br>Status: %{customdata[2]}<br>Vertraging: %{customdata[3]} min<extra></extra>"
+                ),
+                "name": "huidige positie",
+            }
         )
 
-    fig.update_layout(
-        template="plotly_dark",
-        title="Trajectkaart per trein",
-        geo={
-            "scope": "europe",
-            "projection_type": "mercator",
-            "center": {"lat": 50.7, "lon": 4.4},
-            "lataxis": {"range": [48.5, 52.5]},
-            "lonaxis": {"range": [1.5, 7.5]},
-            "showland": True,
-            "landcolor": "#1f2b3a",
-            "showocean": True,
-            "oceancolor": "#0f1722",
-            "countrycolor": "#3b4d63",
+    return {
+        "data": traces,
+        "layout": {
+            "template": DARK_TEMPLATE,
+            "title": {"text": "Trajectkaart per trein"},
+            "geo": {
+                "scope": "europe",
+                "projection": {"type": "mercator"},
+                "center": {"lat": 50.7, "lon": 4.4},
+                "lataxis": {"range": [48.5, 52.5]},
+                "lonaxis": {"range": [1.5, 7.5]},
+                "showland": True,
+                "landcolor": "#1f2b3a",
+                "showocean": True,
+                "oceancolor": "#0f1722",
+                "countrycolor": "#3b4d63",
+            },
+            "margin": {"l": 20, "r": 20, "t": 60, "b": 20},
+            "legend": {"orientation": "h"},
         },
-        margin={"l": 20, "r": 20, "t": 60, "b": 20},
-        legend={"orientation": "h"},
-    )
-    return fig
+    }
 
 
 def _build_summary(train: Dict[str, Any]) -> html.Div:
@@ -186,11 +202,12 @@ def _build_stop_rows(train: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     realtime = train.get("realtime_updates", [])
     if realtime:
+        known_stops = train.get("known_stops", {})
         rows = []
         for stop in realtime[-1].get("stop_updates", []):
             rows.append(
                 {
-                    "station": train.get("known_stops", {}).get(stop.get("base_stop_id")) or "-",
+                    "station": known_stops.get(stop.get("base_stop_id")) or "-",
                     "stop_id": stop.get("stop_id"),
                     "platform": stop.get("platform") or "-",
                     "arrival": stop.get("arrival_time") or "-",
@@ -210,9 +227,11 @@ def _build_platform_block(train: Dict[str, Any]) -> html.Div:
     if not platform_changes and not skipped:
         return html.Div("Geen spoorwissels of skip-events gedetecteerd.", className="note note-ok")
 
+    known_stops = train.get("known_stops", {})
     items: List[html.Li] = []
     for change in platform_changes[:50]:
-        station = train.get("known_stops", {}).get(change.get("base_stop_id"), change.get("base_stop_id"))
+        base_stop_id = change.get("base_stop_id")
+        station = known_stops.get(base_stop_id, base_stop_id)
         items.append(
             html.Li(
                 f"[{change.get('observed_at')}] {station}: spoor {change.get('old_platform')} → {change.get('new_platform')}"
@@ -220,24 +239,18 @@ def _build_platform_block(train: Dict[str, Any]) -> html.Div:
         )
 
     for skip in skipped[:50]:
-        station = train.get("known_stops", {}).get(skip.get("base_stop_id"), skip.get("base_stop_id"))
+        base_stop_id = skip.get("base_stop_id")
+        station = known_stops.get(base_stop_id, base_stop_id)
         items.append(html.Li(f"[{skip.get('observed_at')}] overgeslagen halte: {station}"))
 
     return html.Div([html.Div("Spoorwijzigingen en verstoringen", className="section-title"), html.Ul(items, className="event-list")])
 
 
-def register_train_callbacks(app: Dash, train_index: Dict[str, Any]) -> None:
+def register_train_callbacks(app: Dash, train_index: Dict[str, Any]) -> Callable[[Optional[str]], Tuple[Any, ...]]:
     trains = train_index.get("trains", {})
 
-    @app.callback(
-        Output("train-summary", "children"),
-        Output("delay-graph", "figure"),
-        Output("route-graph", "figure"),
-        Output("stops-table", "data"),
-        Output("platform-events", "children"),
-        Input("train-dropdown", "value"),
-    )
-    def update_train_tab(train_id: str):
+    @lru_cache(maxsize=256)
+    def render_train(train_id: Optional[str]):
         train = trains.get(train_id)
         if not train:
             empty = _empty_figure("Geen data", "Selecteer een trein om details te zien.")
@@ -250,3 +263,16 @@ def register_train_callbacks(app: Dash, train_index: Dict[str, Any]) -> None:
             _build_stop_rows(train),
             _build_platform_block(train),
         )
+
+    @app.callback(
+        Output("train-summary", "children"),
+        Output("delay-graph", "figure"),
+        Output("route-graph", "figure"),
+        Output("stops-table", "data"),
+        Output("platform-events", "children"),
+        Input("train-dropdown", "value"),
+    )
+    def update_train_tab(train_id: str):
+        return render_train(train_id)
+
+    return render_train
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from datetime import datetime
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
 
 
 def _parse_snapshot_datetime(snapshot_id: str, exported_at: Optional[str]) -> datetime:
@@ -34,14 +35,39 @@ def _read_json(file_path: Path) -> Any:
         return {"_error": f"Invalid JSON in {file_path.name}: {exc}"}
 
 
+def _scan_dir(directory: Path, want_dirs: bool, suffix: str = "") -> List[Path]:
+    with os.scandir(directory) as entries:
+        return sorted(
+            Path(entry.path)
+            for entry in entries
+            if (entry.is_dir() if want_dirs else entry.is_file()) and entry.name.endswith(suffix)
+        )
+
+
+def _endpoint_entry(name: str, path: Path, meta: Dict[str, Any], preload: Optional[FrozenSet[str]]) -> Dict[str, Any]:
+    entry = {"name": name, "path": str(path), "meta": meta}
+    if preload is None or name in preload:
+        entry["payload"] = _read_json(path)
+    return entry
+
+
+def load_endpoint_payload(endpoint: Dict[str, Any]) -> Any:
+    """Return the endpoint payload, reading it from disk on first access."""
+    if "payload" not in endpoint:
+        endpoint["payload"] = _read_json(Path(endpoint.get("path", "")))
+    return endpoint["payload"]
+
+
 def unwrap_endpoint_body(payload: Any) -> Any:
     if isinstance(payload, dict) and "body" in payload:
         return payload.get("body")
     return payload
 
 
-def load_snapshot_repository(snapshot_root: Path | str) -> Dict[str, Any]:
+def load_snapshot_repository(snapshot_root: Path | str, preload: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Index snapshots; only endpoints in preload are parsed upfront (None parses all)."""
     root = Path(snapshot_root)
+    preload_names = frozenset(preload) if preload is not None else None
     snapshots: List[Dict[str, Any]] = []
 
     if not root.exists():
@@ -49,12 +75,13 @@ def load_snapshot_repository(snapshot_root: Path | str) -> Dict[str, Any]:
             "root": str(root),
             "snapshot_count": 0,
             "snapshots": [],
+            "snapshots_by_id": {},
             "latest_snapshot_id": None,
             "endpoint_names": [],
             "errors": [f"Snapshot root does not exist: {root}"],
         }
 
-    for snapshot_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+    for snapshot_dir in _scan_dir(root, want_dirs=True):
         manifest_path = snapshot_dir / "manifest.json"
         manifest = _read_json(manifest_path) if manifest_path.exists() else {}
 
@@ -71,21 +98,11 @@ def load_snapshot_repository(snapshot_root: Path | str) -> Dict[str, Any]:
                 endpoint_name = str(item.get("name") or Path(str(item.get("path", ""))).stem)
                 rel_path = str(item.get("path") or f"{endpoint_name}.json")
                 endpoint_path = snapshot_dir / rel_path
-                endpoints[endpoint_name] = {
-                    "name": endpoint_name,
-                    "path": str(endpoint_path),
-                    "meta": item,
-                    "payload": _read_json(endpoint_path),
-                }
+                endpoints[endpoint_name] = _endpoint_entry(endpoint_name, endpoint_path, item, preload_names)
         else:
-            for endpoint_path in sorted(snapshot_dir.glob("*.json")):
+            for endpoint_path in _scan_dir(snapshot_dir, want_dirs=False, suffix=".json"):
                 endpoint_name = endpoint_path.stem
-                endpoints[endpoint_name] = {
-                    "name": endpoint_name,
-                    "path": str(endpoint_path),
-                    "meta": {},
-                    "payload": _read_json(endpoint_path),
-                }
+                endpoints[endpoint_name] = _endpoint_entry(endpoint_name, endpoint_path, {}, preload_names)
 
         snapshots.append(
             {
@@ -106,6 +123,7 @@ def load_snapshot_repository(snapshot_root: Path | str) -> Dict[str, Any]:
         "root": str(root),
         "snapshot_count": len(snapshots),
         "snapshots": snapshots,
+        "snapshots_by_id": {snapshot["id"]: snapshot for snapshot in snapshots},
         "latest_snapshot_id": latest["id"] if latest else None,
         "endpoint_names": sorted(latest["endpoints"].keys()) if latest else [],
         "errors": [],
@@ -115,10 +133,7 @@ def load_snapshot_repository(snapshot_root: Path | str) -> Dict[str, Any]:
 def get_snapshot(repository: Dict[str, Any], snapshot_id: Optional[str]) -> Optional[Dict[str, Any]]:
     if not snapshot_id:
         return None
-    for snapshot in repository.get("snapshots", []):
-        if snapshot.get("id") == snapshot_id:
-            return snapshot
-    return None
+    return repository.get("snapshots_by_id", {}).get(snapshot_id)
 
 
 def get_endpoint_payload(repository: Dict[str, Any], snapshot_id: Optional[str], endpoint_name: Optional[str]) -> Any:
@@ -133,7 +148,7 @@ def get_endpoint_payload(repository: Dict[str, Any], snapshot_id: Optional[str],
     if not endpoint:
         return None
 
-    return endpoint.get("payload")
+    return load_endpoint_payload(endpoint)
 
 
 def snapshot_options(repository: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from .snapshot_loader import unwrap_endpoint_body
+from .snapshot_loader import load_endpoint_payload, unwrap_endpoint_body
+
+TRAIN_INDEX_ENDPOINTS = ("realtime", "trajectories")
 
 
 def _to_int(value: Any, default: int = 0) -> int:
@@ -56,10 +59,12 @@ def _infer_position(train: Dict[str, Any]) -> Dict[str, Any]:
 
         now_epoch = int(datetime.now(timezone.utc).timestamp())
         current_idx = 0
-        for idx, stop in enumerate(stops):
-            checkpoint = _to_int(stop.get("departure_timestamp"), 0) or _to_int(stop.get("arrival_timestamp"), 0)
+        for idx in range(len(stops) - 1, -1, -1):
+            stop = stops[idx]
+            checkpoint = stop.get("departure_timestamp") or stop.get("arrival_timestamp")
             if checkpoint and checkpoint <= now_epoch:
                 current_idx = idx
+                break
 
         current_stop = stops[current_idx]
         next_stop = stops[current_idx + 1] if current_idx + 1 < len(stops) else None
@@ -68,8 +73,8 @@ def _infer_position(train: Dict[str, Any]) -> Dict[str, Any]:
         lon = current_stop.get("lon")
 
         if next_stop and lat is not None and lon is not None:
-            dep_ts = _to_int(current_stop.get("departure_timestamp"), 0)
-            arr_ts = _to_int(next_stop.get("arrival_timestamp"), 0)
+            dep_ts = current_stop.get("departure_timestamp")
+            arr_ts = next_stop.get("arrival_timestamp")
             if dep_ts and arr_ts and dep_ts < now_epoch < arr_ts:
                 progress = (now_epoch - dep_ts) / (arr_ts - dep_ts)
                 next_lat = next_stop.get("lat")
@@ -121,7 +126,7 @@ def _ensure_train(trains: Dict[str, Dict[str, Any]], trip_id: str) -> Dict[str,
             "platform_changes": [],
             "skipped_stops": [],
             "known_stops": {},
-            "_platform_history": {},
+            "_platform_history": defaultdict(set),
         }
     return trains[trip_id]
 
@@ -134,7 +139,8 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
         observed_at = snapshot.get("exported_at") or snapshot_id
         endpoints = snapshot.get("endpoints", {})
 
-        realtime_payload = endpoints.get("realtime", {}).get("payload")
+        realtime_endpoint = endpoints.get("realtime")
+        realtime_payload = load_endpoint_payload(realtime_endpoint) if realtime_endpoint else None
         realtime_body = unwrap_endpoint_body(realtime_payload)
         entities = realtime_body.get("entity", []) if isinstance(realtime_body, dict) else []
 
@@ -183,9 +189,9 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
                     )
 
                 if base_stop_id:
-                    platform_history = train["_platform_history"].setdefault(base_stop_id, set())
+                    platform_history = train["_platform_history"][base_stop_id]
                     if platform and platform_history and platform not in platform_history:
-                        previous = sorted(platform_history)[-1]
+                        previous = max(platform_history)
                         train["platform_changes"].append(
                             {
                                 "snapshot_id": snapshot_id,
@@ -233,7 +239,8 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
                 }
             )
 
-        trajectories_payload = endpoints.get("trajectories", {}).get("payload")
+        trajectories_endpoint = endpoints.get("trajectories")
+        trajectories_payload = load_endpoint_payload(trajectories_endpoint) if trajectories_endpoint else None
         trajectories_body = unwrap_endpoint_body(trajectories_payload)
         trajectories = trajectories_body.get("data", []) if isinstance(trajectories_body, dict) else []
 
@@ -260,8 +267,8 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
                 stop_id = stop.get("stop_id")
                 base_stop_id, platform = _split_stop_id(stop_id)
 
-                station = stop.get("station", {})
-                location = station.get("location", {})
+                station = stop.get("station") or {}
+                location = station.get("location") or {}
                 lat = _to_float(location.get("latitude"))
                 lon = _to_float(location.get("longitude"))
 
@@ -286,8 +293,8 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
                         "lon": lon,
                         "arrival_datetime": arrival.get("datetime"),
                         "departure_datetime": departure.get("datetime"),
-                        "arrival_timestamp": arrival.get("timestamp"),
-                        "departure_timestamp": departure.get("timestamp"),
+                        "arrival_timestamp": _to_int(arrival.get("timestamp"), 0) or None,
+                        "departure_timestamp": _to_int(departure.get("timestamp"), 0) or None,
                         "delay_seconds": delay_seconds,
                         "status": departure.get("status") or arrival.get("status"),
                     }
@@ -327,7 +334,14 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
         finalized[trip_id] = train
 
     train_options: List[Dict[str, str]] = []
+    trains_with_delay = 0
+    trains_with_platform_changes = 0
     for trip_id, train in sorted(finalized.items()):
+        if any(item.get("delay_minutes", 0) > 0 for item in train.get("delay_history", [])):
+            trains_with_delay += 1
+        if train.get("platform_changes"):
+            trains_with_platform_changes += 1
+
         route_name = train.get("route", {}).get("route_name") or train.get("trip", {}).get("trip_headsign")
         trip_number = train.get("trip_number")
 
@@ -342,11 +356,6 @@ def build_train_index(repository: Dict[str, Any]) -> Dict[str, Any]:
 
         train_options.append({"label": f"{label} ({trip_id})", "value": trip_id})
 
-    trains_with_delay = sum(
-        1 for train in finalized.values() if any(item.get("delay_minutes", 0) > 0 for item in train.get("delay_history", []))
-    )
-    trains_with_platform_changes = sum(1 for train in finalized.values() if train.get("platform_changes"))
-
     return {
         "trains": finalized,
         "train_options": train_options,
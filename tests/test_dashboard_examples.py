@@ -1,8 +1,17 @@
 """Tests for dashboard pipeline over examples snapshot data."""
 
+import json
 from pathlib import Path
 
-from nmbs_dashboard.app.services.snapshot_loader import get_endpoint_payload, load_snapshot_repository
+from dash import Dash
+
+from nmbs_dashboard.app.callbacks import register_train_callbacks
+from nmbs_dashboard.app.callbacks.train_callbacks import WEBGL_POINT_THRESHOLD, _build_delay_figure
+from nmbs_dashboard.app.services.snapshot_loader import (
+    get_endpoint_payload,
+    load_snapshot_repository,
+    render_json_preview,
+)
 from nmbs_dashboard.app.services.train_model import build_train_index
 
 
@@ -40,3 +49,62 @@ def test_latest_realtime_payload_is_available() -> None:
     payload = get_endpoint_payload(repository, snapshot_id, "realtime")
     assert payload is not None
     assert payload.get("name") == "realtime"
+
+
+def test_preload_defers_unlisted_endpoint_payloads() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    snapshot_root = project_root / "examples" / "endpoint_snapshots"
+
+    repository = load_snapshot_repository(snapshot_root, preload=("realtime",))
+    snapshot_id = repository["latest_snapshot_id"]
+    endpoints = repository["snapshots"][-1]["endpoints"]
+
+    assert "payload" in endpoints["realtime"]
+    assert "payload" not in endpoints["health"]
+
+    payload = get_endpoint_payload(repository, snapshot_id, "health")
+    assert payload is not None
+    assert endpoints["health"]["payload"] is payload
+
+
+def test_json_preview_truncates_large_payload() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    snapshot_root = project_root / "examples" / "endpoint_snapshots"
+
+    repository = load_snapshot_repository(snapshot_root)
+    payload = get_endpoint_payload(repository, repository["latest_snapshot_id"], "cache_realtime")
+    full = json.dumps(payload, indent=2, ensure_ascii=False)
+
+    preview = render_json_preview(payload, max_chars=100)
+
+    assert len(full) > 100
+    assert preview.startswith(full[:100])
+    assert preview.endswith(f"[truncated {len(full) - 100} characters]")
+
+
+def test_train_renderer_caches_per_train() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    snapshot_root = project_root / "examples" / "endpoint_snapshots"
+
+    index = build_train_index(load_snapshot_repository(snapshot_root))
+    render_train = register_train_callbacks(Dash(__name__), index)
+    train_id = index["train_options"][0]["value"]
+
+    first = render_train(train_id)
+    second = render_train(train_id)
+
+    assert second is first
+    assert render_train.cache_info().hits == 1
+
+    render_train.cache_clear()
+    assert render_train(train_id) is not first
+
+
+def test_delay_figure_switches_to_webgl_above_threshold() -> None:
+    history = [
+        {"observed_at": str(idx), "delay_minutes": idx % 5, "source": "realtime"}
+        for idx in range(WEBGL_POINT_THRESHOLD + 1)
+    ]
+
+    assert _build_delay_figure({"delay_history": history})["data"][0]["type"] == "scattergl"
+    assert _build_delay_figure({"delay_history": history[:WEBGL_POINT_THRESHOLD]})["data"][0]["type"] == "scatter"